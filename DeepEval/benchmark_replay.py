@@ -0,0 +1,94 @@
+import argparse
+import yaml
+import os
+import time
+
+from typing import Dict, List, Any
+from deepeval import evaluate
+from deepeval.dataset import EvaluationDataset
+from deepeval.evaluate.configs import DisplayConfig
+from manager.DeepevalManager import DeepevalManager, TraceCapture
+from utils.utils import groupby_conversation_id
+
+
+DISPLAY_CONFIG = DisplayConfig(print_results=False, show_indicator=False)
+
+
+def run_live(manager: DeepevalManager, eval_data_list: List[Dict[str, Any]]) -> int:
+    """Baseline path: per-golden `@observe` replay inside `evals_iterator`."""
+    test_cases = []
+    dataset = EvaluationDataset(goldens=[manager.build_golden(eval_data) for eval_data in eval_data_list])
+    for golden in dataset.evals_iterator(metrics=[TraceCapture(test_cases)], display_config=DISPLAY_CONFIG):
+        manager.agent(golden.input, golden.tools_called, golden.actual_output)
+    return len(test_cases)
+
+
+def run_offline(manager: DeepevalManager, eval_data_list: List[Dict[str, Any]]) -> int:
+    """Offline path: batch-built test cases scored by one `evaluate` call."""
+    test_cases = []
+    evaluate(
+        test_cases=[manager.build_test_case(eval_data, name=f"test_case_{i}") for i, eval_data in enumerate(eval_data_list)],
+        metrics=[TraceCapture(test_cases)],
+        display_config=DISPLAY_CONFIG
+    )
+    return len(test_cases)
+
+
+def main(config: Dict, repeat: int, rounds: int):
+    """
+    Measure the per-golden cost of capturing and evaluating logged agent
+    executions end to end, with the judge replaced by the no-op
+    `TraceCapture` metric so only the replay/tracing overhead remains.
+    """
+
+    config_deepeval = config["deepeval"]
+    deepevalManager = DeepevalManager(
+        evaluation_model=config_deepeval["evaluation_model"],
+        evaluation_threshold=config_deepeval["evaluation_threshold"],
+        evaluation_metrics=config_deepeval["evaluation_metrics"]
+    )
+
+    conversation_id_grouped_data = groupby_conversation_id(config["data"]["input"])
+    eval_data_list = [
+        eval_data
+        for value in conversation_id_grouped_data.values()
+        for eval_data in value
+    ] * repeat
+
+    timings = {}
+    for mode, run in (("live", run_live), ("offline", run_offline)):
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            num_captured = run(deepevalManager, eval_data_list)
+            elapsed = time.perf_counter() - start
+            assert num_captured == len(eval_data_list)
+            best = elapsed if best is None else min(best, elapsed)
+        timings[mode] = best / len(eval_data_list)
+
+    print(f"goldens: {len(eval_data_list)} (best of {rounds})")
+    print(f"live    (@observe replay + evals_iterator): {timings['live'] * 1e6:10.1f} us/golden")
+    print(f"offline (batch test cases + evaluate)     : {timings['offline'] * 1e6:10.1f} us/golden")
+    print(f"overhead removed                          : {(timings['live'] - timings['offline']) * 1e6:10.1f} us/golden")
+
+    return
+
+
+if __name__ == '__main__':
+    CONFIG_PATH='config_deepeval.yml'
+
+    parser = argparse.ArgumentParser(description="Benchmark live vs offline trace replay.")
+    parser.add_argument('--config-path', type=str, default=CONFIG_PATH, help='Path to the YAML configuration file')
+    parser.add_argument('--repeat', type=int, default=20, help='Number of times the log is replicated')
+    parser.add_argument('--rounds', type=int, default=3, help='Number of timed rounds per mode')
+    args = parser.parse_args()
+
+    config_path = args.config_path
+
+    if not os.path.isfile(config_path):
+        raise FileNotFoundError(f"The configuration file '{config_path}' does not exist.")
+
+    with open(config_path, 'r') as file:
+        config = yaml.safe_load(file)
+
+    main(config, args.repeat, args.rounds)
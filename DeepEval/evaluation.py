@@ -18,12 +18,44 @@ def main(config: Dict):
     deepevalManager = DeepevalManager(
         evaluation_model=evaluation_model,
         evaluation_threshold=evaluation_threshold,
-        evaluation_metrics=evaluation_metrics
+        evaluation_metrics=evaluation_metrics,
+        replay_mode=config_deepeval.get("replay_mode", "live")
     )
 
     config_data = config["data"]
     conversation_id_grouped_data = groupby_conversation_id(config_data["input"])
 
+    config_sampling = config_deepeval.get("sampling", {})
+    if config_sampling.get("enabled", False):
+        eval_data_list = [
+            eval_data
+            for value in conversation_id_grouped_data.values()
+            for eval_data in value
+        ]
+        results = deepevalManager.evaluate_application_sampled(
+            eval_data_list=eval_data_list,
+            precision=config_sampling["precision"],
+            confidence=config_sampling["confidence"],
+            stratify_by=config_sampling["stratify_by"],
+            interval=config_sampling["interval"],
+            min_samples=config_sampling["min_samples"],
+            batch_size=config_sampling["batch_size"],
+            seed=config_sampling["seed"],
+            deduplicate_inputs=config_deepeval.get("deduplicate", False)
+        )
+        print(results)
+        return
+
+    if config_deepeval.get("deduplicate", False):
+        eval_data_list = [
+            eval_data
+            for value in conversation_id_grouped_data.values()
+            for eval_data in value
+        ]
+        results = deepevalManager.evaluate_application_deduplicated(eval_data_list=eval_data_list)
+        print(results)
+        return
+
     for key, value in conversation_id_grouped_data.items():
         results = deepevalManager.evaluate_application(eval_data_list=value)
         print(results)
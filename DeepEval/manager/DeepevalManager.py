@@ -1,14 +1,62 @@
 from typing import Dict, Any, List
+from time import perf_counter
+from uuid import uuid4
 from deepeval import evaluate
-from deepeval.metrics import ArgumentCorrectnessMetric, ToolCorrectnessMetric, PlanAdherenceMetric, PlanQualityMetric, StepEfficiencyMetric, TaskCompletionMetric
+from deepeval.evaluate.configs import AsyncConfig, DisplayConfig, ErrorConfig
+from deepeval.metrics import BaseMetric, ArgumentCorrectnessMetric, ToolCorrectnessMetric, PlanAdherenceMetric, PlanQualityMetric, StepEfficiencyMetric, TaskCompletionMetric
 from deepeval.test_case import LLMTestCase, ToolCall
 from deepeval.dataset import Golden, EvaluationDataset
-from deepeval.tracing import observe, update_current_trace
+from deepeval.tracing import observe, update_current_trace, trace_manager
+from deepeval.tracing.types import BaseSpan, TraceSpanStatus
+from deepeval.tracing.utils import make_json_serializable
 from collections import defaultdict
+from utils.utils import wilson_interval, bootstrap_interval, stratified_order, canonical_key, deduplicate
+
+
+REPLAY_MODES = ("live", "offline")
+
+STRATIFY_KEYS = {
+    "conversation": lambda eval_data: eval_data["conversation_info"]["conversation_id"],
+    "tool": lambda eval_data: tuple(
+        tool["function"]["name"]
+        for step in eval_data["step"]
+        for tool in step["tool"]
+    ),
+    "none": lambda eval_data: None,
+}
+
+
+class TraceCapture(BaseMetric):
+    """
+    No-op trace-level metric that only records the test case DeepEval
+    builds for each golden, so the whole batch can be scored afterwards
+    with a single `deepeval.evaluate` call.
+    """
+    requires_trace = True
+
+    def __init__(self, test_cases: List[LLMTestCase]):
+        self.threshold = 0.0
+        self.test_cases = test_cases
+
+    def measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:
+        self.test_cases.append(test_case)
+        self.score = 1.0
+        self.success = True
+        return self.score
+
+    async def a_measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:
+        return self.measure(test_case)
+
+    def is_successful(self) -> bool:
+        return True
+
+    @property
+    def __name__(self):
+        return "Trace Capture"
 
 
 class DeepevalManager():
-    def __init__(self, evaluation_model: str, evaluation_threshold: str, evaluation_metrics: List):
+    def __init__(self, evaluation_model: str, evaluation_threshold: str, evaluation_metrics: List, replay_mode: str = "live"):
         """
         DeepevalManager is a unified wrapper class for managing and configuring
         multiple DeepEval evaluation metrics used in LLM-based application
@@ -46,6 +94,16 @@ class DeepevalManager():
                     }
                 }
 
+            replay_mode (str):
+                How logged agent executions are turned into evaluable
+                test cases.
+                    - "live" (default): replay every golden through the
+                      `@observe` decorated `agent` / `tool_call` methods.
+                    - "offline": build the same LLMTestCase objects and
+                      trace dicts for the whole batch directly from the
+                      parsed log, without any live tracing context
+                      (see `build_test_case`).
+
         Supported Evaluation Types:
             - application:
                 Metrics for evaluating high-level agent behavior such as
@@ -62,8 +120,12 @@ class DeepevalManager():
             (application-level vs tool-level evaluation)
         """
 
+        if replay_mode not in REPLAY_MODES:
+            raise ValueError(f"Unsupported replay_mode '{replay_mode}', expected one of {list(REPLAY_MODES)}")
+
         self.evaluation_model = evaluation_model
         self.evaluation_threshold = evaluation_threshold
+        self.replay_mode = replay_mode
         self.metrics = {
             "planAdherenceMetric":{
                 "metric": PlanAdherenceMetric(
@@ -186,20 +248,143 @@ class DeepevalManager():
         )
 
 
+    def build_golden(self, eval_data: Dict[str, Any]) -> Golden:
+        """
+        Build a DeepEval `Golden` from a single agent log record.
+
+        Args:
+            eval_data (Dict[str, Any]):
+                One agent log record containing "task", "시스템_response"
+                and "step" (with step-level tool usage).
+
+        Returns:
+            Golden:
+                A Golden whose tools_called are reconstructed from the
+                tool usage of every step, in execution order.
+        """
+        tools_called = [
+            ToolCall(name=tool["function"]["name"])
+            for step in eval_data["step"]
+            for tool in step["tool"]
+        ]
+
+        return Golden(
+            input=eval_data["task"],
+            tools_called=tools_called,
+            actual_output=eval_data["시스템_response"]
+        )
+
+    def build_test_case(self, eval_data: Dict[str, Any], name: str = None) -> LLMTestCase:
+        """
+        Build a DeepEval `LLMTestCase` with its trace from a single agent log
+        record, without opening a live tracing context.
+
+        The trace is assembled from DeepEval's own span types and serialized
+        with `trace_manager.create_nested_spans_dict`, reproducing the spans
+        that replaying the record through `agent` / `tool_call` records.
+        Inputs and tool calls come from `build_golden`, so both replay
+        modes send identical test cases to the judge.
+
+        Args:
+            eval_data (Dict[str, Any]):
+                One agent log record, same format as `build_golden`.
+            name (str, optional):
+                Test case name, used to match evaluation results back
+                to records.
+
+        Returns:
+            LLMTestCase:
+                A test case ready to be passed to `deepeval.evaluate`.
+        """
+        golden = self.build_golden(eval_data)
+        self_name = f"<{self.__class__.__name__}>"
+        tools = make_json_serializable(golden.tools_called)
+        trace_uuid = str(uuid4())
+        start_time = perf_counter()
+
+        tool_call_span = BaseSpan(
+            uuid=str(uuid4()),
+            trace_uuid=trace_uuid,
+            status=TraceSpanStatus.SUCCESS,
+            start_time=start_time,
+            name="tool_call",
+            input=trace_manager.mask(make_json_serializable({"self": self_name, "tools": golden.tools_called})),
+            output=trace_manager.mask(tools)
+        )
+        agent_span = BaseSpan(
+            uuid=str(uuid4()),
+            trace_uuid=trace_uuid,
+            status=TraceSpanStatus.SUCCESS,
+            start_time=start_time,
+            name="agent",
+            input=trace_manager.mask(make_json_serializable({
+                "self": self_name,
+                "input": golden.input,
+                "tools": golden.tools_called,
+                "actual_output": golden.actual_output
+            })),
+            children=[tool_call_span]
+        )
+
+        test_case = LLMTestCase(
+            name=name,
+            input=golden.input,
+            actual_output=golden.actual_output,
+            tools_called=golden.tools_called
+        )
+        test_case._trace_dict = trace_manager.create_nested_spans_dict(agent_span)
+        return test_case
+
+    def capture_test_cases(self, eval_data_list: List[Any]) -> List[LLMTestCase]:
+        """
+        Turn a batch of agent log records into trace-backed test cases,
+        named "test_case_{i}" in input order, without running any judge.
+
+        In "live" replay mode each golden is replayed through the `@observe`
+        decorated `agent` inside `evals_iterator`, and the test cases DeepEval
+        builds from those traces are collected by the no-op `TraceCapture`
+        metric. In "offline" mode they are built directly by `build_test_case`.
+        """
+        if self.replay_mode == "offline":
+            return [
+                self.build_test_case(eval_data, name=f"test_case_{i}")
+                for i, eval_data in enumerate(eval_data_list)
+            ]
+
+        test_cases = []
+        dataset = EvaluationDataset(goldens=[self.build_golden(eval_data) for eval_data in eval_data_list])
+        for golden in dataset.evals_iterator(
+            metrics=[TraceCapture(test_cases)],
+            async_config=AsyncConfig(run_async=False),
+            display_config=DisplayConfig(print_results=False, show_indicator=False)
+        ):
+            self.agent(golden.input, golden.tools_called, golden.actual_output)
+
+        if len(test_cases) != len(eval_data_list):
+            raise RuntimeError(f"Captured {len(test_cases)} traces for {len(eval_data_list)} goldens")
+        for i, test_case in enumerate(test_cases):
+            test_case.name = f"test_case_{i}"
+        return test_cases
+
     def evaluate_application(self, eval_data_list: List[Any]) -> Dict:
         """
         Run application-level evaluation using DeepEval metrics.
 
         This method converts raw evaluation data into DeepEval `Golden`
-        objects, constructs an `EvaluationDataset`, and evaluates each
-        sample using application-level metrics such as planning quality,
-        task completion, and step efficiency.
+        objects, replays them into trace-backed test cases, and evaluates
+        each sample using application-level metrics such as planning
+        quality, task completion, and step efficiency.
 
         The evaluation flow is as follows:
             1. Parse evaluation data and build Golden objects
-            2. Create an EvaluationDataset from the goldens
-            3. Replay agent execution to populate traces
-            4. Compute metric scores from the recorded traces
+            2. Capture a trace-backed test case per golden
+               (see `capture_test_cases`)
+            3. Compute metric scores for the whole batch with a single
+               `deepeval.evaluate` call (see `_score_batch`)
+
+        Both replay modes share this flow and return the same shape:
+        "live" captures through the `@observe` replay of `agent`, while
+        "offline" builds the same test cases directly from the log.
 
         Args:
             eval_data_list (List[Any]):
@@ -213,12 +398,13 @@ class DeepevalManager():
         Returns:
             dict:
                 A dictionary mapping application-level metric names
-                to a list of computed scores.
+                to one score per record, aligned with `eval_data_list`.
+                A metric that errored on a record gets None for it.
 
                 Example:
                 {
-                    "planAdherenceMetric": [0.92],
-                    "taskCompletionMetric": [1.0],
+                    "planAdherenceMetric": [0.92, 0.5, None],
+                    "taskCompletionMetric": [1.0, 1.0, 0.0],
                     ...
                 }
 
@@ -229,32 +415,296 @@ class DeepevalManager():
             - This method performs offline evaluation by replaying agent
               executions rather than running live inference.
         """
-        
-        results = defaultdict(list)
-
-        goldens = []
-        for eval_data in eval_data_list:
-            input = eval_data["task"]
-            response =  eval_data["시스템_response"]
-            tools_called = [
-                ToolCall(name=tool["function"]["name"])
-                for step in eval_data["step"]
-                for tool in step["tool"]
-            ]
-            
-            goldens.append(Golden(input=input, tools_called=tools_called, actual_output=response))
+        target_metrics = {
+            key: value["metric"] for key, value in self.metrics.items()
+            if value["eval_type"] == "application"
+        }
+
+        results = {metric_name: [] for metric_name in target_metrics}
+        for scored in self._score_batch(eval_data_list, target_metrics):
+            for metric_name in target_metrics:
+                metric_result = scored[metric_name]
+                results[metric_name].append(metric_result["score"] if metric_result is not None else None)
+
+        return results
+
+    def evaluate_application_sampled(
+        self,
+        eval_data_list: List[Any],
+        precision: float = 0.02,
+        confidence: float = 0.95,
+        stratify_by: str = "conversation",
+        interval: str = "wilson",
+        min_samples: int = 10,
+        batch_size: int = 10,
+        seed: int = 0,
+        deduplicate_inputs: bool = False
+    ) -> Dict:
+        """
+        Estimate application-level metrics from a stratified sample,
+        stopping as soon as every metric reaches the requested precision.
+
+        Records are taken batch by batch from a proportionally stratified
+        ordering of `eval_data_list` (see `stratified_order`), and each batch
+        is scored with a single `_score_batch` call. After each batch, a
+        confidence interval is recomputed for every application metric;
+        once all interval half-widths are within `precision` (and every
+        metric has at least `min_samples` scored samples), no further judge
+        calls are made.
+
+        A metric that errored or returned no score for a record is not
+        counted as a score of 0 / a fail: the record is skipped for that
+        metric and counted in "num_errored".
+
+        With `deduplicate_inputs`, records are first collapsed by
+        `canonical_key` (as in `evaluate_application_deduplicated`) and the
+        sample is drawn over unique goldens. Each unique golden is weighted
+        by its number of occurrences, so estimates still describe the full
+        traffic; the Wilson interval then uses the Kish effective sample size.
+        Since a unique golden can span several conversations, "conversation"
+        stratification is rejected in this mode.
 
-        dataset = EvaluationDataset(goldens=goldens)
-        target_metrics = [
-            value["metric"] for key, value in self.metrics.items() 
+        Args:
+            eval_data_list (List[Any]):
+                Agent log records, in the same format as `evaluate_application`.
+
+            precision (float):
+                Target half-width of the confidence interval (e.g. 0.02 for ±2%).
+
+            confidence (float):
+                Confidence level of the interval.
+
+            stratify_by (str):
+                Stratum key used for sampling. One of "conversation",
+                "tool" (ordered tool-name sequence) or "none".
+
+            interval (str):
+                "wilson" for a Wilson interval on the pass rate, or
+                "bootstrap" for a percentile bootstrap interval on the
+                mean score.
+
+            min_samples (int):
+                Minimum number of scored samples per metric before early
+                stopping is allowed.
+
+            batch_size (int):
+                Number of records scored per judge dispatch.
+
+            seed (int):
+                Random seed for sampling and bootstrap resampling.
+
+            deduplicate_inputs (bool):
+                Sample over unique goldens instead of raw records.
+                Requires stratify_by "tool" or "none".
+
+        Returns:
+            dict:
+                Example:
+                {
+                    "metrics": {
+                        "planAdherenceMetric": {
+                            "estimate": 0.85,
+                            "interval": (0.83, 0.87),
+                            "num_samples": 118,
+                            "num_errored": 2,
+                            "scores": [...]
+                        },
+                        ...
+                    },
+                    "num_evaluated": 120,
+                    "num_total": 1500,
+                    "judge_calls_avoided": 5520,
+                    "converged": True,
+                    "dedup": {...}  # only with deduplicate_inputs
+                }
+        """
+        if stratify_by not in STRATIFY_KEYS:
+            raise ValueError(f"Unsupported stratify_by '{stratify_by}', expected one of {list(STRATIFY_KEYS)}")
+        if interval not in ("wilson", "bootstrap"):
+            raise ValueError(f"Unsupported interval '{interval}', expected 'wilson' or 'bootstrap'")
+        if deduplicate_inputs and stratify_by == "conversation":
+            raise ValueError(
+                "stratify_by 'conversation' cannot be combined with deduplicate_inputs: "
+                "a unique golden repeated across conversations has no single conversation stratum. "
+                "Use 'tool' or 'none'."
+            )
+
+        target_metrics = {
+            key: value["metric"] for key, value in self.metrics.items()
             if value["eval_type"] == "application"
+        }
+        if deduplicate_inputs:
+            unique_eval_data, occurrence_index = deduplicate(eval_data_list, canonical_key)
+        else:
+            unique_eval_data, occurrence_index = eval_data_list, list(range(len(eval_data_list)))
+        occurrences = [0] * len(unique_eval_data)
+        for index in occurrence_index:
+            occurrences[index] += 1
+        population = [
+            {"eval_data": eval_data, "weight": occurrences[index]}
+            for index, eval_data in enumerate(unique_eval_data)
         ]
-        
-        for golden in dataset.evals_iterator(metrics=target_metrics):
-            self.agent(golden.input, golden.tools_called, golden.actual_output)
-        
-        for metric_name, metric_value in self.metrics.items():
-            if metric_value['eval_type'] == 'application':
-                results[metric_name].append(metric_value["metric"].score)
 
+        scores = {metric_name: [] for metric_name in target_metrics}
+        successes = {metric_name: [] for metric_name in target_metrics}
+        weights = {metric_name: [] for metric_name in target_metrics}
+        num_errored = {metric_name: 0 for metric_name in target_metrics}
+        summary = {}
+
+        stratify_key = STRATIFY_KEYS[stratify_by]
+        ordered = stratified_order(population, lambda unit: stratify_key(unit["eval_data"]), seed=seed)
+        num_evaluated = 0
+        converged = False
+        for start in range(0, len(ordered), batch_size):
+            batch = ordered[start:start + batch_size]
+            for unit, scored in zip(batch, self._score_batch([unit["eval_data"] for unit in batch], target_metrics)):
+                for metric_name in target_metrics:
+                    metric_result = scored[metric_name]
+                    if metric_result is None:
+                        num_errored[metric_name] += 1
+                        continue
+                    scores[metric_name].append(metric_result["score"])
+                    successes[metric_name].append(metric_result["success"])
+                    weights[metric_name].append(unit["weight"])
+            num_evaluated += len(batch)
+
+            for metric_name in target_metrics:
+                num_samples = len(scores[metric_name])
+                total_weight = sum(weights[metric_name])
+                if num_samples == 0:
+                    estimate = None
+                    lower, upper = 0.0, 1.0
+                elif interval == "wilson":
+                    estimate = sum(
+                        weight for weight, success in zip(weights[metric_name], successes[metric_name]) if success
+                    ) / total_weight
+                    effective_n = total_weight ** 2 / sum(weight ** 2 for weight in weights[metric_name])
+                    lower, upper = wilson_interval(estimate * effective_n, effective_n, confidence)
+                else:
+                    estimate = sum(
+                        weight * score for weight, score in zip(weights[metric_name], scores[metric_name])
+                    ) / total_weight
+                    lower, upper = bootstrap_interval(scores[metric_name], confidence, seed=seed, weights=weights[metric_name])
+                summary[metric_name] = {
+                    "estimate": estimate,
+                    "interval": (lower, upper),
+                    "num_samples": num_samples,
+                    "num_errored": num_errored[metric_name],
+                    "scores": scores[metric_name]
+                }
+
+            if all(
+                value["num_samples"] >= min_samples
+                and (value["interval"][1] - value["interval"][0]) / 2 <= precision
+                for value in summary.values()
+            ):
+                converged = True
+                break
+
+        results = {
+            "metrics": summary,
+            "num_evaluated": num_evaluated,
+            "num_total": len(eval_data_list),
+            "judge_calls_avoided": (len(eval_data_list) - num_evaluated) * len(target_metrics),
+            "converged": converged
+        }
+        if deduplicate_inputs:
+            results["dedup"] = {
+                "num_total": len(eval_data_list),
+                "num_unique": len(unique_eval_data),
+                "dedup_ratio": len(eval_data_list) / len(unique_eval_data) if unique_eval_data else 1.0
+            }
         return results
+
+    def evaluate_application_deduplicated(self, eval_data_list: List[Any]) -> Dict:
+        """
+        Run application-level evaluation once per unique golden and fan the
+        scores back out to every occurrence.
+
+        Production logs repeat the same task, tool-call sequence and response
+        across many conversation_ids. Records are grouped by `canonical_key`
+        (normalized task, ordered tool names/arguments, normalized response),
+        only the first record of each group is sent to the judge, and its
+        scores are copied to every other record of the group.
+
+        Args:
+            eval_data_list (List[Any]):
+                Agent log records, in the same format as `evaluate_application`.
+                Records may span several conversations.
+
+        Returns:
+            dict:
+                Per-metric scores aligned with `eval_data_list` (None where
+                the metric errored for that input), and a dedup report.
+
+                Example:
+                {
+                    "metrics": {
+                        "planAdherenceMetric": [0.92, 0.92, 0.5, ...],
+                        ...
+                    },
+                    "dedup": {
+                        "num_total": 1500,
+                        "num_unique": 300,
+                        "dedup_ratio": 5.0,
+                        "judge_calls_avoided": 4800
+                    }
+                }
+        """
+        target_metrics = {
+            key: value["metric"] for key, value in self.metrics.items()
+            if value["eval_type"] == "application"
+        }
+
+        unique_eval_data, occurrence_index = deduplicate(eval_data_list, canonical_key)
+        unique_results = self._score_batch(unique_eval_data, target_metrics)
+
+        results = {metric_name: [] for metric_name in target_metrics}
+        for index in occurrence_index:
+            for metric_name in target_metrics:
+                metric_result = unique_results[index].get(metric_name)
+                results[metric_name].append(metric_result["score"] if metric_result is not None else None)
+
+        num_total = len(eval_data_list)
+        num_unique = len(unique_eval_data)
+        return {
+            "metrics": results,
+            "dedup": {
+                "num_total": num_total,
+                "num_unique": num_unique,
+                "dedup_ratio": num_total / num_unique if num_unique else 1.0,
+                "judge_calls_avoided": (num_total - num_unique) * len(target_metrics)
+            }
+        }
+
+    def _score_batch(self, eval_data_list: List[Any], target_metrics: Dict[str, Any]) -> List[Dict]:
+        """
+        Score every record and return, per record, the per-metric score
+        and pass/fail result for every metric in `target_metrics`, or None
+        when the metric errored, returned no score or was not run.
+
+        Test cases for the whole batch are captured first (see
+        `capture_test_cases`) and then scored with a single
+        `deepeval.evaluate` call, in either replay mode.
+        """
+        test_cases = self.capture_test_cases(eval_data_list)
+        metric_keys = {metric.__name__: key for key, metric in target_metrics.items()}
+        evaluation_result = evaluate(
+            test_cases=test_cases,
+            metrics=list(target_metrics.values()),
+            error_config=ErrorConfig(ignore_errors=True),
+            display_config=DisplayConfig(print_results=False, show_indicator=False)
+        )
+
+        scored = defaultdict(dict)
+        for test_result in evaluation_result.test_results:
+            for metric_data in test_result.metrics_data or []:
+                if metric_data.name in metric_keys and metric_data.error is None and metric_data.score is not None:
+                    scored[test_result.name][metric_keys[metric_data.name]] = {
+                        "score": metric_data.score,
+                        "success": bool(metric_data.success)
+                    }
+        return [
+            {metric_name: scored[test_case.name].get(metric_name) for metric_name in target_metrics}
+            for test_case in test_cases
+        ]
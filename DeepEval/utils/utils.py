@@ -1,5 +1,10 @@
 import json
-from typing import List, Dict, Any
+import math
+import random
+import re
+import unicodedata
+from statistics import NormalDist
+from typing import List, Dict, Any, Callable, Hashable, Optional, Tuple
 from collections import defaultdict
 
 
@@ -27,4 +32,135 @@ def groupby_conversation_id(path: str) -> List[List[Dict[str, Any]]]:
             conversation_id = item["conversation_info"]["conversation_id"]
             grouped[conversation_id].append(item)
             
-    return grouped
\ No newline at end of file
+    return grouped
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial pass rate.
+
+    Returns (0.0, 1.0) when no sample has been observed yet.
+    """
+    if n == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def bootstrap_interval(
+    values: List[float],
+    confidence: float = 0.95,
+    num_resamples: int = 1000,
+    seed: int = 0,
+    weights: Optional[List[float]] = None
+) -> Tuple[float, float]:
+    """
+    Percentile bootstrap interval for the (optionally weighted) mean of
+    `values` (scores in [0, 1]).
+
+    One pseudo-observation at each end of the range (0.0 and 1.0), with the
+    average weight, is added before resampling, Agresti-Coull style, so a
+    sample whose scores are all identical still gets an interval of width
+    ~1/n instead of zero width.
+
+    Returns (0.0, 1.0) when no sample has been observed yet.
+    """
+    if not values:
+        return 0.0, 1.0
+
+    rng = random.Random(seed)
+    weights = list(weights) if weights is not None else [1.0] * len(values)
+    mean_weight = sum(weights) / len(weights)
+    pairs = list(zip(values, weights)) + [(0.0, mean_weight), (1.0, mean_weight)]
+    n = len(pairs)
+    means = []
+    for _ in range(num_resamples):
+        resample = rng.choices(pairs, k=n)
+        means.append(sum(value * weight for value, weight in resample) / sum(weight for _, weight in resample))
+    means.sort()
+    alpha = (1 - confidence) / 2
+    lower = means[int(alpha * (num_resamples - 1))]
+    upper = means[int((1 - alpha) * (num_resamples - 1))]
+    return lower, upper
+
+
+def stratified_order(items: List[Any], key_fn: Callable[[Any], Hashable], seed: int = 0) -> List[Any]:
+    """
+    Order `items` so that every prefix is a proportionally allocated
+    stratified sample.
+
+    Each stratum is shuffled and its k-th item (out of m) gets the position
+    key (k + u) / m, with u a random offset drawn once per stratum; items
+    are then sorted by key. Within a stratum the items are spread evenly
+    over [0, 1), so a prefix holds each stratum in proportion to its size,
+    and every item's key is uniform on [0, 1), so every item has the same
+    chance of being in any prefix and the plain mean of a prefix is an
+    unbiased estimate of the population mean.
+    """
+    rng = random.Random(seed)
+    strata = defaultdict(list)
+    for item in items:
+        strata[key_fn(item)].append(item)
+
+    keyed = []
+    for bucket in strata.values():
+        rng.shuffle(bucket)
+        offset = rng.random()
+        for rank, item in enumerate(bucket):
+            keyed.append(((rank + offset) / len(bucket), item))
+
+    keyed.sort(key=lambda pair: pair[0])
+    return [item for _, item in keyed]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for equality checks: NFKC, collapsed whitespace, stripped.
+    """
+    if text is None:
+        return ""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def canonical_key(eval_data: Dict[str, Any]) -> str:
+    """
+    Canonical key of an agent log record.
+
+    Two records share a key when they have the same normalized task, the
+    same ordered tool calls (name and arguments, ignoring call ids) and the
+    same normalized response, i.e. when a judge would see identical inputs.
+    """
+    tools = [
+        [tool["function"]["name"], tool["function"].get("arguments")]
+        for step in eval_data["step"]
+        for tool in step["tool"]
+    ]
+    return json.dumps(
+        [normalize_text(eval_data["task"]), tools, normalize_text(eval_data["시스템_response"])],
+        ensure_ascii=False,
+        sort_keys=True
+    )
+
+
+def deduplicate(items: List[Any], key_fn: Callable[[Any], Hashable]) -> Tuple[List[Any], List[int]]:
+    """
+    Keep the first occurrence of every key.
+
+    Returns the unique items and, for every input item, the index of its
+    unique representative, so results can be fanned back out with
+    `[unique_results[i] for i in occurrence_index]`.
+    """
+    unique_items = []
+    occurrence_index = []
+    seen = {}
+    for item in items:
+        key = key_fn(item)
+        if key not in seen:
+            seen[key] = len(unique_items)
+            unique_items.append(item)
+        occurrence_index.append(seen[key])
+    return unique_items, occurrence_index
@@ -27,7 +27,22 @@ def main(config: Dict):
     
 
     # run evaluate
-    mlflowManager.evaluate(dataset=data, answer_generator=qa_predict_fn)
+    config_sampling = config_evaluation.get("sampling", {})
+    if config_sampling.get("enabled", False):
+        results = mlflowManager.evaluate_sampled(
+            dataset=data,
+            answer_generator=qa_predict_fn,
+            precision=config_sampling["precision"],
+            confidence=config_sampling["confidence"],
+            stratify_by=config_sampling["stratify_by"],
+            interval=config_sampling["interval"],
+            min_samples=config_sampling["min_samples"],
+            batch_size=config_sampling["batch_size"],
+            seed=config_sampling["seed"]
+        )
+        print(results)
+    else:
+        mlflowManager.evaluate(dataset=data, answer_generator=qa_predict_fn)
     
     return
 
@@ -1,10 +1,13 @@
 import os
-from typing import List, Dict, Callable
+import math
+import functools
+from typing import List, Dict, Any, Callable, Optional
 from contextlib import contextmanager
 
 import mlflow
 from mlflow.genai import scorer
 from mlflow.genai.scorers import Correctness, Guidelines
+from utils.utils import wilson_interval, bootstrap_interval, stratified_order
 
 
 class MLflowLogger():
@@ -41,15 +44,26 @@ class MLflowLogger():
 
         # set evaluation
         scorers_registry = {
-            "CORRECTNESS": Correctness(),
-            "IS_CONCISE": is_concise, 
-            "IS_KOREAN": Guidelines(name="is_korean", guidelines="The answer must be in 한글")
+            "CORRECTNESS": {
+                "scorer": Correctness(),
+                "is_judge": True
+            },
+            "IS_CONCISE": {
+                "scorer": is_concise,
+                "is_judge": False
+            },
+            "IS_KOREAN": {
+                "scorer": Guidelines(name="is_korean", guidelines="The answer must be in 한글"),
+                "is_judge": True
+            }
         }
 
         if scorers is not None:
             self.scorers = []
+            self.num_judge_scorers = 0
             for scorer in scorers:
-                self.scorers.append(scorers_registry[scorer])
+                self.scorers.append(scorers_registry[scorer]["scorer"])
+                self.num_judge_scorers += scorers_registry[scorer]["is_judge"]
 
 
     @contextmanager
@@ -117,7 +131,211 @@ class MLflowLogger():
             predict_fn=answer_generator,
             scorers=self.scorers,
         )
-    
+
+    def evaluate_sampled(
+        self,
+        dataset: List,
+        answer_generator: Callable,
+        precision: float = 0.02,
+        confidence: float = 0.95,
+        stratify_by: str = None,
+        interval: str = "wilson",
+        min_samples: int = 10,
+        batch_size: int = 10,
+        seed: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Estimate scorer results from a stratified sample of the dataset.
+
+        Rows are evaluated batch by batch in a proportionally stratified
+        order. After each batch, a confidence interval is recomputed for every
+        scorer and evaluation stops once all interval half-widths are within
+        `precision`. A scorer value that is missing or not a yes/no/number
+        (e.g. an errored judge) is skipped for that scorer and counted in
+        "num_errored" instead of being scored as a fail.
+
+        All batches are evaluated inside a single MLflow run, each batch in
+        its own nested run, and the final summary (mean score over the
+        sample, estimates, intervals, calls made/avoided) is logged to the
+        parent run. `answer_generator` is traced once up front so MLflow's
+        per-call trace validation, which costs one extra prediction per
+        `mlflow.genai.evaluate` call, is skipped.
+
+        Args:
+            dataset (List[Dict[str, Any]]): Evaluation dataset, same as `evaluate`.
+            answer_generator (Callable): Prediction function, same as `evaluate`.
+            precision (float): Target interval half-width (e.g. 0.02 for ±2%).
+            confidence (float): Confidence level of the interval.
+            stratify_by (str, optional): Dot-separated path of the stratum key
+                in each row (e.g. "tags.subset"). None means no stratification.
+            interval (str): "wilson" (pass rate) or "bootstrap" (mean score).
+            min_samples (int): Minimum number of scored rows per scorer before early stopping.
+            batch_size (int): Number of rows sent to each `mlflow.genai.evaluate` call.
+            seed (int): Random seed for sampling and bootstrap resampling.
+
+        Returns:
+            dict: Per-scorer estimate and achieved interval, the number of
+                  rows evaluated, and the number of judge calls avoided.
+        """
+        if interval not in ("wilson", "bootstrap"):
+            raise ValueError(f"Unsupported interval '{interval}', expected 'wilson' or 'bootstrap'")
+
+        def stratum(row: Dict) -> Any:
+            if stratify_by is None:
+                return None
+            for key in stratify_by.split("."):
+                row = row.get(key) if isinstance(row, dict) else None
+            return row
+
+        ordered = stratified_order(dataset, stratum, seed=seed)
+        scorer_names = [scorer.name for scorer in self.scorers]
+        scores = {}
+        num_errored = {}
+        summary = {}
+        num_evaluated = 0
+        converged = False
+        num_predict_calls = 0
+
+        @functools.wraps(answer_generator)
+        def counted_answer_generator(*args, **kwargs):
+            nonlocal num_predict_calls
+            num_predict_calls += 1
+            return answer_generator(*args, **kwargs)
+
+        # trace once here so mlflow.genai.evaluate can skip its per-call
+        # validation, which would run one extra prediction per batch
+        traced_answer_generator = mlflow.trace(counted_answer_generator)
+
+        with self.start_run(), skip_trace_validation():
+            self.log_params({
+                "sampling_precision": precision,
+                "sampling_confidence": confidence,
+                "sampling_stratify_by": stratify_by,
+                "sampling_interval": interval,
+                "sampling_min_samples": min_samples,
+                "sampling_batch_size": batch_size,
+                "sampling_seed": seed
+            })
+
+            for start in range(0, len(ordered), batch_size):
+                batch = ordered[start:start + batch_size]
+                # each batch gets a nested run so its aggregate metrics
+                # (e.g. "<scorer>/mean") do not overwrite each other
+                with mlflow.start_run(run_name=f"batch_{start // batch_size}", nested=True):
+                    results = mlflow.genai.evaluate(
+                        data=batch,
+                        predict_fn=traced_answer_generator,
+                        scorers=self.scorers,
+                    )
+                num_evaluated += len(batch)
+
+                result_df = results.result_df
+                for scorer_name in scorer_names:
+                    column = f"{scorer_name}/value"
+                    if result_df is not None and column in result_df.columns:
+                        values = result_df[column]
+                    else:
+                        values = [None] * len(batch)
+                    for value in values:
+                        score = to_score(value)
+                        if score is None:
+                            num_errored[scorer_name] = num_errored.get(scorer_name, 0) + 1
+                        else:
+                            scores.setdefault(scorer_name, []).append(score)
+
+                for scorer_name in scorer_names:
+                    values = scores.get(scorer_name, [])
+                    if not values:
+                        estimate = None
+                        lower, upper = 0.0, 1.0
+                    elif interval == "wilson":
+                        passed = sum(value >= 0.5 for value in values)
+                        estimate = passed / len(values)
+                        lower, upper = wilson_interval(passed, len(values), confidence)
+                    else:
+                        estimate = sum(values) / len(values)
+                        lower, upper = bootstrap_interval(values, confidence, seed=seed)
+                    summary[scorer_name] = {
+                        "estimate": estimate,
+                        "interval": (lower, upper),
+                        "num_samples": len(values),
+                        "num_errored": num_errored.get(scorer_name, 0)
+                    }
+
+                if summary and all(
+                    value["num_samples"] >= min_samples
+                    and (value["interval"][1] - value["interval"][0]) / 2 <= precision
+                    for value in summary.values()
+                ):
+                    converged = True
+                    break
+
+            report = {
+                "scorers": summary,
+                "num_evaluated": num_evaluated,
+                "num_total": len(dataset),
+                "predict_calls_made": num_predict_calls,
+                "predict_calls_avoided": len(dataset) - num_predict_calls,
+                "judge_calls_avoided": (len(dataset) - num_evaluated) * self.num_judge_scorers,
+                "converged": converged
+            }
+
+            summary_metrics = {
+                "sampling/num_evaluated": num_evaluated,
+                "sampling/num_total": len(dataset),
+                "sampling/predict_calls_made": report["predict_calls_made"],
+                "sampling/predict_calls_avoided": report["predict_calls_avoided"],
+                "sampling/judge_calls_avoided": report["judge_calls_avoided"],
+                "sampling/converged": int(converged)
+            }
+            for scorer_name, value in summary.items():
+                if scores.get(scorer_name):
+                    summary_metrics[f"{scorer_name}/mean"] = sum(scores[scorer_name]) / len(scores[scorer_name])
+                summary_metrics[f"{scorer_name}/sampled_estimate"] = value["estimate"]
+                summary_metrics[f"{scorer_name}/sampled_interval_lower"] = value["interval"][0]
+                summary_metrics[f"{scorer_name}/sampled_interval_upper"] = value["interval"][1]
+                summary_metrics[f"{scorer_name}/sampled_num_samples"] = value["num_samples"]
+                summary_metrics[f"{scorer_name}/sampled_num_errored"] = value["num_errored"]
+            self.log_metrics(summary_metrics)
+
+        return report
+
+
+@contextmanager
+def skip_trace_validation():
+    """Temporarily set MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION for `mlflow.genai.evaluate`."""
+    previous = os.environ.get("MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION")
+    os.environ["MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION"] = "true"
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION")
+        else:
+            os.environ["MLFLOW_GENAI_EVAL_SKIP_TRACE_VALIDATION"] = previous
+
+
+def to_score(value: Any) -> Optional[float]:
+    """
+    Convert a scorer assessment value ("yes"/"no", bool or number) to a float
+    score. Returns None for missing or unrecognized values (e.g. an errored judge).
+    """
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("yes", "true", "pass"):
+            return 1.0
+        if value in ("no", "false", "fail"):
+            return 0.0
+        return None
+    if value is None:
+        return None
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(score) else score
+
+
 @scorer
 def is_concise(outputs: str) -> bool:
     """Evaluate if the answer is concise (less than 5 words)"""
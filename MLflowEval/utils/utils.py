@@ -0,0 +1,88 @@
+import math
+import random
+from statistics import NormalDist
+from typing import List, Any, Callable, Hashable, Optional, Tuple
+from collections import defaultdict
+
+
+def wilson_interval(successes: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial pass rate.
+
+    Returns (0.0, 1.0) when no sample has been observed yet.
+    """
+    if n == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def bootstrap_interval(
+    values: List[float],
+    confidence: float = 0.95,
+    num_resamples: int = 1000,
+    seed: int = 0,
+    weights: Optional[List[float]] = None
+) -> Tuple[float, float]:
+    """
+    Percentile bootstrap interval for the (optionally weighted) mean of
+    `values` (scores in [0, 1]).
+
+    One pseudo-observation at each end of the range (0.0 and 1.0), with the
+    average weight, is added before resampling, Agresti-Coull style, so a
+    sample whose scores are all identical still gets an interval of width
+    ~1/n instead of zero width.
+
+    Returns (0.0, 1.0) when no sample has been observed yet.
+    """
+    if not values:
+        return 0.0, 1.0
+
+    rng = random.Random(seed)
+    weights = list(weights) if weights is not None else [1.0] * len(values)
+    mean_weight = sum(weights) / len(weights)
+    pairs = list(zip(values, weights)) + [(0.0, mean_weight), (1.0, mean_weight)]
+    n = len(pairs)
+    means = []
+    for _ in range(num_resamples):
+        resample = rng.choices(pairs, k=n)
+        means.append(sum(value * weight for value, weight in resample) / sum(weight for _, weight in resample))
+    means.sort()
+    alpha = (1 - confidence) / 2
+    lower = means[int(alpha * (num_resamples - 1))]
+    upper = means[int((1 - alpha) * (num_resamples - 1))]
+    return lower, upper
+
+
+def stratified_order(items: List[Any], key_fn: Callable[[Any], Hashable], seed: int = 0) -> List[Any]:
+    """
+    Order `items` so that every prefix is a proportionally allocated
+    stratified sample.
+
+    Each stratum is shuffled and its k-th item (out of m) gets the position
+    key (k + u) / m, with u a random offset drawn once per stratum; items
+    are then sorted by key. Within a stratum the items are spread evenly
+    over [0, 1), so a prefix holds each stratum in proportion to its size,
+    and every item's key is uniform on [0, 1), so every item has the same
+    chance of being in any prefix and the plain mean of a prefix is an
+    unbiased estimate of the population mean.
+    """
+    rng = random.Random(seed)
+    strata = defaultdict(list)
+    for item in items:
+        strata[key_fn(item)].append(item)
+
+    keyed = []
+    for bucket in strata.values():
+        rng.shuffle(bucket)
+        offset = rng.random()
+        for rank, item in enumerate(bucket):
+            keyed.append(((rank + offset) / len(bucket), item))
+
+    keyed.sort(key=lambda pair: pair[0])
+    return [item for _, item in keyed]